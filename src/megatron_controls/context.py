@@ -1,4 +1,6 @@
 import asyncio
+import sys
+from operator import attrgetter
 from types import SimpleNamespace
 
 _device_mapping = {
@@ -19,23 +21,37 @@ _device_mapping = {
 _required_devices = ("galil", "galil_val", "galil_rbv", "ION_Pump_PS")
 
 
+def _resolve_device_mapping(devices, device_mapping):
+    """Map each name in ``device_mapping`` directly to its device or signal object in ``devices``."""
+    return {sys.intern(name): attrgetter(path)(devices) for name, path in device_mapping.items()}
+
+
 def create_shared_context(devices):
     for device in _required_devices:
         if device not in devices:
             raise RuntimeError(f"Device {device} is missing in the devices list")
 
+    devices = SimpleNamespace(**devices)
     return SimpleNamespace(
-        devices=SimpleNamespace(**devices),
+        devices=devices,
         galil_abs_rel=0,  # 0 - absolute, 1 - relative
         galil_pos=0,
         galil_speed=1000000,
         device_mapping=_device_mapping,
         required_devices=_required_devices,
+        # PV name -> signal of the PVs written to the log file; filled in by the caller. A running logger notices
+        # when the dict is replaced; after changing it in place, also increment 'logged_signals_version'.
         logged_signals={},
+        logged_signals_version=0,
         logging_stop_event=asyncio.Event(),
+        _logging_task=None,
+        _log_rate=1.0,
+        _logging_wakeup=None,  # Future awaited by the running logger between rows; 'lograte' completes it
         log_file_path="",
         logging_dir="",
         script_dir="",
         fail_condition_triggered=False,
-        _name_to_device={},
+        smtp_client=None,  # Connection reused by the 'email' command, see 'megatron_control.close_smtp'
+        _name_to_device=_resolve_device_mapping(devices, _device_mapping),
+        _plot_cache={},
     )
@@ -7,12 +7,44 @@ from .exceptions import CommandNotFoundError, LoopSyntaxError, StopScript
 from .megatron_control import process_megatron_command
 from .motor_control import process_motor_command
 
+_T_RE = re.compile(r"t([\d.]+)", re.IGNORECASE)
+_L_RE = re.compile(r"l(\d+)", re.IGNORECASE)
+_TOK_RE = re.compile(r'(?:(?:"([^"]+)")|([^\s,]+))')
+
+# Op codes of the compiled script representation produced by ``MegatronInterpreter._compile_script``
+_OP_TIMER = 1  # (_OP_TIMER, timer_value)
+_OP_LOOP = 2  # (_OP_LOOP, loop_count, block)
+_OP_COMMAND = 3  # (_OP_COMMAND, process_command, command, args)
+_OP_ERROR = 4  # (_OP_ERROR, message)
+
+
+def _match_timer(line):
+    """Return the value of a 't<seconds>' timer line, or None if the line is not a timer."""
+    if line[:1] not in ("t", "T"):
+        return None
+    value = line[1:]
+    if value.replace(".", "").isdecimal():  # The common case: nothing follows the value
+        return value
+    match_t = _T_RE.match(line)
+    return match_t.group(1) if match_t else None
+
+
+def _match_loop(line):
+    """Return the count of an 'l<count>' loop header, or None if the line is not a loop header."""
+    if line[:1] not in ("l", "L"):
+        return None
+    value = line[1:]
+    if value.isdecimal():  # The common case: nothing follows the count
+        return int(value)
+    match_l = _L_RE.match(line)
+    return int(match_l.group(1)) if match_l else None
+
 
 class MegatronInterpreter:
     def __init__(self, *, shared_context):
         self.context = shared_context
         self.context.run_script_callback = self.execute_script  # Set the callback for running sub-scripts
-        self._process_supported_devices()
+        self._script_cache = {}  # script path -> ((mtime, size), compiled ops)
 
         self.megatron_commands = [
             "email",
@@ -77,61 +109,35 @@ class MegatronInterpreter:
             "tp",
             "xq",
         ]
-
-    def _process_supported_devices(self):
-        for desc, nm in self.context.device_mapping.items():
-            parts = nm.split(".")
-            obj = self.context.devices
-            for part in parts:
-                obj = getattr(obj, part)
-            self.context._name_to_device[desc] = obj
+        self.megatron_commands = frozenset(self.megatron_commands)
+        self.motor_commands = frozenset(self.motor_commands)
+        self._command_processors = {
+            **dict.fromkeys(self.megatron_commands, process_megatron_command),
+            **dict.fromkeys(self.motor_commands, process_motor_command),
+        }
 
     def execute_script(self, script_path):
-        with open(script_path) as script_file:
-            script_lines = script_file.readlines()
+        ops = self._load_script(script_path)
 
         def plan():
-            i = 0
-            while i < len(script_lines):
-                line = script_lines[i].strip()
-                if line.startswith("#"):  # Ignore comments
-                    i += 1
-                    continue
-
-                if not line:
-                    yield from bps.null()
-                    i += 1
-                    continue
-
-                match_t = re.match(r"t([\d.]+)", line, re.IGNORECASE)
-                match_l = re.match(r"l(\d+)", line, re.IGNORECASE)
-
+            for op in ops:
+                kind = op[0]
                 try:
-                    if match_t:
-                        timer_value = match_t.group(1)
-                        yield from self.handle_timer(timer_value)
-                    elif match_l:
-                        loop_count = int(match_l.group(1))
-                        loop_end = self.find_end_of_loop(script_lines, i)
-                        if loop_end == -1:
-                            raise LoopSyntaxError()
-                        loop_block = script_lines[i + 1 : loop_end]
-                        yield from self.handle_loop(loop_count, loop_block)
-                        i = loop_end
-                    else:
-                        command, *args = self.tokenize_command(line)
-                        if command in self.megatron_commands:
-                            yield from process_megatron_command(command, args, self.context)
-                        elif command in self.motor_commands:
-                            yield from process_motor_command(command, args, self.context)
-                        else:
-                            raise CommandNotFoundError(command)
+                    if kind == _OP_TIMER:
+                        yield from self.handle_timer(op[1])
+                    elif kind == _OP_LOOP:
+                        yield from self.handle_loop(op[1], op[2])
+                    elif kind == _OP_COMMAND:
+                        _, process_command, command, args = op
+                        yield from process_command(command, args, self.context)
+                    else:  # _OP_ERROR
+                        print(op[1])
+                        yield from bps.null()
                 except StopScript:
                     break
                 except (CommandNotFoundError, LoopSyntaxError) as e:
                     print(e)
                     yield from bps.null()
-                i += 1
 
                 if self.context.fail_condition_triggered:
                     self.context.fail_condition_triggered = False
@@ -141,9 +147,66 @@ class MegatronInterpreter:
 
         yield from plan()
 
+    def _load_script(self, script_path):
+        """Return the compiled ops of a script, reading and compiling it again only if the file changed."""
+        stat = os.stat(script_path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._script_cache.get(script_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        ops = self._compile_script(self._read_script_lines(script_path))
+        self._script_cache[script_path] = (key, ops)
+        return ops
+
+    def _read_script_lines(self, script_path):
+        """Read a script as a list of lines with surrounding whitespace already stripped."""
+        with open(script_path) as script_file:
+            return [line.strip() for line in script_file]
+
+    def _compile_script(self, lines):
+        """Parse stripped script lines once into a list of ops executed by ``execute_script``."""
+        loop_map = self._map_loops(lines)
+        return self._compile_lines(lines, 0, len(lines), loop_map, top_level=True)
+
+    def _compile_lines(self, lines, start, end, loop_map, *, top_level):
+        ops = []
+        i = start
+        while i < end:
+            line = lines[i]
+            if not line or (top_level and line.startswith("#")):  # Blank lines and comments are no-ops
+                i += 1
+                continue
+
+            timer_value = _match_timer(line)
+            loop_count = _match_loop(line) if timer_value is None else None
+
+            if timer_value is not None:
+                ops.append((_OP_TIMER, timer_value))
+            elif loop_count is not None:
+                loop_end = loop_map.get(i, -1)
+                if loop_end == -1:
+                    if not top_level:
+                        raise LoopSyntaxError()
+                    ops.append((_OP_ERROR, str(LoopSyntaxError())))
+                else:
+                    loop_block = self._compile_lines(lines, i + 1, loop_end, loop_map, top_level=False)
+                    ops.append((_OP_LOOP, loop_count, loop_block))
+                    i = loop_end
+            else:
+                command, *args = self.tokenize_command(line)
+                process_command = self._command_processors.get(command)
+                if process_command is not None:
+                    ops.append((_OP_COMMAND, process_command, command, args))
+                elif top_level:  # Unrecognized commands inside loops are skipped
+                    ops.append((_OP_ERROR, str(CommandNotFoundError(command))))
+            i += 1
+        return ops
+
     def tokenize_command(self, line):
-        regex = r'(?:(?:"([^"]+)")|([^\s,]+))'
-        tokens = re.findall(regex, line)
+        if '"' not in line:  # No quoted strings: splitting on separators is enough
+            return line.replace(",", " ").split()
+        tokens = _TOK_RE.findall(line)
         return [t[0] or t[1] for t in tokens if t[0] or t[1]]
 
     def handle_timer(self, timer_value):
@@ -155,57 +218,30 @@ class MegatronInterpreter:
             print(f"Executing loop iteration {_ + 1} of {loop_count}")
             yield from self.execute_block(block)
 
-    def find_end_of_loop(self, lines, start_index):
-        loop_depth = 0
-        for i in range(start_index + 1, len(lines)):
-            line = lines[i].strip().lower()
-            if line.startswith("l"):
-                loop_depth += 1
-            elif line == "n":
-                if loop_depth == 0:
-                    return i
-                else:
-                    loop_depth -= 1
-        return -1
+    def _map_loops(self, lines):
+        """Map the index of each loop header to the index of its matching 'n' in a single pass."""
+        loop_map = {}
+        open_loops = []
+        for i, line in enumerate(lines):
+            if _match_loop(line) is not None:
+                open_loops.append(i)
+            elif line in ("n", "N") and open_loops:
+                loop_map[open_loops.pop()] = i
+        return loop_map
 
     def execute_block(self, block):
-        i = 0
-        while i < len(block):
-            line = block[i].strip()
-            if not line:
-                yield from bps.null()
-                i += 1
-                continue
-
-            match_t = re.match(r"t([\d.]+)", line, re.IGNORECASE)
-            match_l = re.match(r"l(\d+)", line, re.IGNORECASE)
-
-            if match_t:
-                timer_value = match_t.group(1)
-                yield from self.handle_timer(timer_value)
-                i += 1
+        for op in block:
+            kind = op[0]
+            if kind == _OP_TIMER:
+                yield from self.handle_timer(op[1])
                 continue
 
-            elif match_l:
-                loop_count = int(match_l.group(1))
-                loop_end = self.find_end_of_loop(block, i)
-
-                if loop_end == -1:
-                    raise LoopSyntaxError()
-
-                nested_block = block[i + 1 : loop_end]
-                yield from self.handle_loop(loop_count, nested_block)
-                i = loop_end + 1
+            if kind == _OP_LOOP:
+                yield from self.handle_loop(op[1], op[2])
                 continue
 
-            command, *args = self.tokenize_command(line)
-
-            if command in self.megatron_commands:
-                yield from process_megatron_command(command, args, self.context)
-            elif command in self.motor_commands:
-                yield from process_motor_command(command, args, self.context)
-
-            i += 1
+            _, process_command, command, args = op
+            yield from process_command(command, args, self.context)
 
             if self.context.fail_condition_triggered:
                 self.context.fail_condition_triggered = False
@@ -221,14 +257,12 @@ class MegatronInterpreter:
 
         scanned_scripts.add(script_path)
 
-        with open(script_path) as script_file:
-            script_lines = script_file.readlines()
-
         logged_pvs = set()
-        for line in script_lines:
-            line = line.strip()
+        for line in self._read_script_lines(script_path):
             if line.startswith("#") or not line:
                 continue
+            if line[:3].lower() not in ("log", "run"):  # Only 'log' and 'run' lines need tokenizing
+                continue
 
             tokens = self.tokenize_command(line)
             if not tokens:
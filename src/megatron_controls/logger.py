@@ -9,25 +9,29 @@ def ts_periodic_logging_wrapper(plan, signals, log_file_path, period=1):
     stop = asyncio.Event()
 
     async def logging_coro():
-        while not stop.is_set():
-            is_new_file = False
-            if not os.path.isfile(log_file_path):
-                dir, _ = os.path.split(log_file_path)
-                os.makedirs(dir, exist_ok=True)
-                is_new_file = True
+        # The file is created (with its header) and opened once, not on every tick
+        is_new_file = not os.path.isfile(log_file_path)
+        if is_new_file:
+            dir, _ = os.path.split(log_file_path)
+            os.makedirs(dir, exist_ok=True)
 
-            timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")
+        # Signals are bound once, so the columns always match the header
+        signal_list = tuple(signals.values())
 
-            with open(log_file_path, "a") as f:
-                if is_new_file:
-                    s = ",".join([f'"{_}"' for _ in signals.keys()])
-                    f.write(f"Timestamp,{s}\n")
+        with open(log_file_path, "a") as f:
+            if is_new_file:
+                s = ",".join([f'"{_}"' for _ in signals.keys()])
+                f.write(f"Timestamp,{s}\n")
 
-                values = [_.value for _ in signals.values()]
+            while not stop.is_set():
+                timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+                values = [_.value for _ in signal_list]
                 s = ",".join([f"{_:.6f}" if isinstance(_, float) else f"{_}" for _ in values])
                 f.write(f"{timestamp},{s}\n")
+                f.flush()
 
-            await asyncio.sleep(period)
+                await asyncio.sleep(period)
 
     class StartStopLogging:
         def __enter__(self):
@@ -1,10 +1,15 @@
 import asyncio
-import inspect
+import csv
+import io
 import os
 import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from types import SimpleNamespace
 
 import bluesky.plan_stubs as bps
 import matplotlib
@@ -14,11 +19,36 @@ from dotenv import load_dotenv
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
+try:
+    import pyarrow  # noqa: F401
+
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
 from .exceptions import CommandNotFoundError, StopScript
-from .support import wait_for_condition
+from .support import build_dispatch, wait_for_condition
 
 active_failif_conditions = {}
 
+_LOG_TIMESTAMP_SECONDS_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_LOG_TIMESTAMP_FORMAT = f"{_LOG_TIMESTAMP_SECONDS_FORMAT}.%f"
+# Buffered log rows are written to the log file once any of these limits is reached
+_LOG_BUFFER_ROWS = 32
+_LOG_BUFFER_SIZE = 64 * 1024  # Characters
+_LOG_FLUSH_INTERVAL = 5.0  # Seconds
+_LOG_STOP_TIMEOUT = 5  # Seconds to wait for a stopped logger to close the log file before starting a new one
+_LOG_TAIL_BLOCK_SIZE = 64 * 1024  # Size of the first block read from the end of the log by 'plot tail=...'
+_SMTP_TIMEOUT = 30  # Seconds allowed for each operation on the SMTP connection
+_SMTP_CLOSE_TIMEOUT = 60  # Seconds 'close_smtp' waits for queued emails before giving up
+
+_plot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="megatron-plot")
+_email_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="megatron-email")
+_plot_figure = None  # Figure and axes shared by 'plot' invocations, see '_get_plot_axes'
+_plot_axes = None
+
+_missing_signal = SimpleNamespace(value=None)  # Stands in for logged signals removed while logging
+
 load_dotenv()
 
 EMAIL_ADDRESS = str(os.getenv("GMAIL_USER"))
@@ -26,35 +56,11 @@ EMAIL_PASSWORD = str(os.getenv("GMAIL_PASS"))
 
 
 def process_megatron_command(command, args, context, current_script_path=None):
-    command_dispatcher = {
-        "email": email,
-        "exit": exit_command,
-        "failif": failif,
-        "failifoff": failifoff,
-        "l": l_command,
-        "log": log,
-        "lograte": lograte,
-        "plot": plot,
-        "print": print_command,
-        "run": run,
-        "set": set,
-        "setao": setao,
-        "setdo": setdo,
-        "stop": stop,
-        "t": t_command,
-        "var": var,
-        "waitai": waitai,
-        "waitdi": waitdi,
-    }
-
-    if command in command_dispatcher:
-        command_function = command_dispatcher[command]
-
-        sig = inspect.signature(command_function)
-        params = list(sig.parameters)
-
-        kwargs = {"args": args, "context": context, "current_script_path": current_script_path}
-        dynamic_args = [kwargs[param] for param in params if param in kwargs]
+    if command in _DISPATCH:
+        command_function, arg_indices = _DISPATCH[command]
+
+        available_args = (args, context, current_script_path)
+        dynamic_args = [available_args[_] for _ in arg_indices]
 
         yield from command_function(*dynamic_args)
     else:
@@ -62,8 +68,15 @@ def process_megatron_command(command, args, context, current_script_path=None):
 
 
 def l_command(block, context):
+    dispatch = _DISPATCH  # Local name for the lookups in the loop
     for line in block:
-        yield from process_megatron_command(line[0], line[1:], context)
+        command = line[0]
+        if command not in dispatch:
+            raise CommandNotFoundError(command)
+
+        command_function, arg_indices = dispatch[command]
+        available_args = (line[1:], context, None)
+        yield from command_function(*[available_args[_] for _ in arg_indices])
 
 
 def t_command(args):
@@ -72,8 +85,9 @@ def t_command(args):
     yield from bps.sleep(timer_duration)
 
 
-def exit_command():
+def exit_command(context):
     print("Exiting the interpreter.")
+    close_smtp(context)
     raise SystemExit
 
 
@@ -81,42 +95,26 @@ def lograte(args, context):
     try:
         log_rate = float(args[0])
         print(f"Setting log rate to {log_rate} seconds.")
-
-        if hasattr(context, "logging_stop_event") and context.logging_stop_event:
-            print("Stopping existing logging...")
-            context.logging_stop_event.set()
-
-        context.logging_stop_event = asyncio.Event()
-
-        async def logging_coro():
-            await asyncio.sleep(0)
-            stop_event = context.logging_stop_event
-            while not stop_event.is_set():
-                is_new_file = False
-                log_file_path = context.log_file_path
-                signals = context.logged_signals
-
-                if not os.path.isfile(log_file_path):
-                    dir, _ = os.path.split(log_file_path)
-                    os.makedirs(dir, exist_ok=True)
-                    is_new_file = True
-
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")
-
-                with open(log_file_path, "a") as f:
-                    if is_new_file:
-                        headers = ",".join([f'"{_}"' for _ in signals.keys()])
-                        f.write(f"Timestamp,{headers}\n")
-
-                    values = [signals[_].value for _ in signals.keys()]
-                    row = ",".join([f"{_:.6f}" if isinstance(_, float) else f"{_}" for _ in values])
-                    f.write(f"{timestamp},{row}\n")
-
-                await asyncio.sleep(log_rate)
-
-        print("Starting periodic logging with new log rate.")
-        yield from bps.sleep(0)
-        asyncio.ensure_future(logging_coro())
+        context._log_rate = log_rate
+
+        task = context._logging_task
+        if task is not None and not task.done() and not context.logging_stop_event.is_set():
+            # Wake the running logger, which then continues at the new rate
+            wakeup = context._logging_wakeup
+            if wakeup is not None:
+                wakeup.get_loop().call_soon_threadsafe(_wake_logger, wakeup, True)
+            print("Periodic logging continues with new log rate.")
+        else:
+            if task is not None and not task.done():
+                # The stopped logger may still be sleeping until its next tick. Cancel it and let it close the
+                # log file first, so two loggers never append to the same file or both write its header.
+                task.get_loop().call_soon_threadsafe(task.cancel)  # The task may run in another RunEngine's loop
+                yield from bps.wait_for([lambda: _wait_for_task(task)], timeout=_LOG_STOP_TIMEOUT)
+            context.logging_stop_event = asyncio.Event()
+            print("Starting periodic logging with new log rate.")
+            yield from bps.sleep(0)
+            loop = asyncio.get_event_loop()
+            context._logging_task = loop.create_task(_logging_coro(context, context.logging_stop_event))
 
     except ValueError:
         print(f"Invalid log rate: {args[0]}. Must be a number.")
@@ -126,7 +124,149 @@ def lograte(args, context):
     yield from bps.null()
 
 
-def email(args):
+def _wait_for_task(task):
+    """Return an awaitable for the running loop that completes when ``task``, possibly of another loop, is done."""
+    task_loop = task.get_loop()
+    if task_loop is asyncio.get_running_loop():
+        return task
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(asyncio.wait([task]), task_loop))
+
+
+def _wake_logger(wakeup, rate_changed):
+    if not wakeup.done():
+        wakeup.set_result(rate_changed)
+
+
+async def _logging_coro(context, stop_event):
+    """Append a row of logged signal values every ``context._log_rate`` seconds until stopped."""
+    await asyncio.sleep(0)
+    time_ns, strftime, localtime = time.time_ns, time.strftime, time.localtime
+    timestamp_seconds = None
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    wakeup = None
+    log_fd = log_file_path = None
+    signals = signals_version = None
+    pending = io.StringIO()  # Rows formatted since the last write to the log file
+    writer = csv.writer(pending, lineterminator="\n")
+    try:
+        while not stop_event.is_set():
+            if log_fd is None or log_file_path != context.log_file_path:
+                if log_fd is not None:
+                    _flush_log_rows(log_fd, pending)
+                    os.close(log_fd)
+                    log_fd = None
+                log_file_path = context.log_file_path
+                signal_names = tuple(context.logged_signals.keys())
+                log_fd = _open_log_file(log_file_path, signal_names)
+                signals = None  # The cached signals follow the columns of the log file
+                unflushed_rows = 0
+                last_flush = loop.time()
+
+            if signals is not context.logged_signals or signals_version != context.logged_signals_version:
+                signals = context.logged_signals
+                signals_version = context.logged_signals_version
+                cached_signals = [signals.get(_, _missing_signal) for _ in signal_names]
+                formatters = [_log_value_formatter(_.value) for _ in cached_signals]
+                if cached_signals and all(_ is _format_float for _ in formatters):
+                    # Only floats: format the whole row, timestamp and line end included, with a single %-operation
+                    row_format = "%s," + ",".join(["%.6f"] * len(cached_signals)) + "\n"
+                else:
+                    row_format = None
+
+            seconds, microseconds = divmod(time_ns() // 1000, 1_000_000)
+            if seconds != timestamp_seconds:  # The date and time part only changes once per second
+                timestamp_seconds = seconds
+                timestamp_prefix = strftime(_LOG_TIMESTAMP_SECONDS_FORMAT, localtime(seconds))
+            timestamp = f"{timestamp_prefix}.{microseconds:06d}"
+            values = (timestamp, *[_.value for _ in cached_signals])
+            try:
+                if row_format is not None:
+                    pending.write(row_format % values)
+                else:
+                    writer.writerow([timestamp, *[fmt(_) for fmt, _ in zip(formatters, values[1:])]])
+            except (TypeError, ValueError):  # A value changed type since the formatters were chosen
+                writer.writerow([timestamp, *[_format_log_value(_) for _ in values[1:]]])
+            unflushed_rows += 1
+            if (
+                unflushed_rows >= _LOG_BUFFER_ROWS
+                or pending.tell() >= _LOG_BUFFER_SIZE
+                or loop.time() - last_flush >= _LOG_FLUSH_INTERVAL
+            ):
+                _flush_log_rows(log_fd, pending)
+                unflushed_rows = 0
+                last_flush = loop.time()
+
+            # Sleep until the next deadline rather than for a fixed period, so time spent writing does not
+            # accumulate as drift. If the logger fell behind, it continues from now instead of catching up.
+            next_tick += context._log_rate
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick -= delay
+                delay = 0
+            # Like 'asyncio.sleep', but 'lograte' can end the wait early through 'context._logging_wakeup'
+            wakeup = context._logging_wakeup = loop.create_future()
+            timer = loop.call_later(delay, _wake_logger, wakeup, False)
+            try:
+                rate_changed = await wakeup
+            finally:
+                timer.cancel()
+            if rate_changed:  # Write the next row now and continue at the new rate from there
+                next_tick = loop.time()
+    finally:
+        if context._logging_wakeup is wakeup:
+            context._logging_wakeup = None
+        if log_fd is not None:
+            try:
+                _flush_log_rows(log_fd, pending)
+                if stop_event.is_set():
+                    os.fsync(log_fd)  # Otherwise durability is left to the page cache
+            finally:
+                os.close(log_fd)
+
+
+_format_float = "{:.6f}".format  # Bound method: formats without running a Python-level function
+
+
+def _format_log_value(value):
+    return f"{value:.6f}" if isinstance(value, float) else value
+
+
+def _log_value_formatter(value):
+    """Pick the formatter for a logged signal based on a sample of its value."""
+    return _format_float if isinstance(value, float) else _format_log_value
+
+
+def _open_log_file(log_file_path, signal_names):
+    """Open the CSV log file as a raw file descriptor for appending, writing the header row if the file is new."""
+    is_new_file = not os.path.isfile(log_file_path)
+    if is_new_file:
+        dir, _ = os.path.split(log_file_path)
+        os.makedirs(dir, exist_ok=True)
+
+    fd = os.open(log_file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    if is_new_file:
+        headers = ",".join([f'"{_}"' for _ in signal_names])
+        _write_log_bytes(fd, f"Timestamp,{headers}\n".encode())
+    return fd
+
+
+def _flush_log_rows(fd, pending):
+    """Write the rows buffered in ``pending`` to the log file with a single encode and empty the buffer."""
+    data = pending.getvalue()
+    if data:
+        _write_log_bytes(fd, data.encode())
+        pending.seek(0)
+        pending.truncate()
+
+
+def _write_log_bytes(fd, data):
+    view = memoryview(data)
+    while view:  # 'os.write' may write only part of the data
+        view = view[os.write(fd, view) :]
+
+
+def email(args, context):
     subject = args[0]
     message = args[1]
     recipients = args[2:]
@@ -137,16 +277,73 @@ def email(args):
     msg["Subject"] = subject
     msg.attach(MIMEText(message, "plain"))
 
+    # Sending runs on the email worker thread so the plan is not blocked by network I/O
+    _email_executor.submit(_send_email, context, recipients, msg.as_string())
+    yield from bps.null()
+
+
+def _send_email(context, recipients, message):
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_ADDRESS, recipients, msg.as_string())
+        server = _get_smtp_client(context)
+        server.sendmail(EMAIL_ADDRESS, recipients, message)
         print(f"Email sent successfully to {', '.join(recipients)}")
     except Exception as e:
         print(f"Failed to send email: {e}")
+        _close_smtp_client(context)  # Reconnect for the next email
 
-    yield from bps.null()
+
+def _get_smtp_client(context):
+    """
+    Return the SMTP connection kept in ``context.smtp_client``, connecting and logging in if needed.
+
+    The connection is reused by later emails, so the TLS handshake and login happen once instead of
+    for every email. A connection that no longer answers NOOP is replaced.
+    """
+    server = context.smtp_client
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _close_smtp_client(context)
+
+    server = smtplib.SMTP("smtp.gmail.com", 587, timeout=_SMTP_TIMEOUT)
+    try:
+        server.starttls()
+        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    context.smtp_client = server
+    return server
+
+
+def _close_smtp_client(context):
+    server, context.smtp_client = context.smtp_client, None
+    if server is not None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+
+def close_smtp(context):
+    """Close the SMTP connection used by 'email' after the emails queued so far have been sent."""
+    try:
+        _email_executor.submit(_close_smtp_client, context).result(timeout=_SMTP_CLOSE_TIMEOUT)
+    except FutureTimeoutError:
+        print("Timed out waiting for queued emails to be sent.")
+
+
+class _FailifState:
+    """Last seen value and target of a 'failif' condition, shared with its PV callback."""
+
+    __slots__ = ("last", "target")
+
+    def __init__(self, last, target):
+        self.last = last
+        self.target = target
 
 
 def failif(args, context):
@@ -163,40 +360,30 @@ def failif(args, context):
         yield from bps.null()
         return
 
-    if pv_name not in context.device_mapping:
-        print(f"Error: PV '{pv_name}' not found in device mapping.")
-        yield from bps.null()
-        return
-
-    device_name = context.device_mapping[pv_name]
-    pv_signal = getattr(context.devices, device_name, None)
+    pv_signal = context._name_to_device.get(pv_name)
     if pv_signal is None:
-        print(f"Error: Device signal for PV '{pv_name}' not found.")
+        print(f"Error: PV '{pv_name}' not found in device mapping.")
         yield from bps.null()
         return
 
     print(f"Failif condition set: {pv_name} triggers fail if is {target_value}. Fail script: {script_name}")
     context.fail_condition_triggered = False
 
-    initial_val = pv_signal.get()
-    last_value_holder = [initial_val]
+    state = _FailifState(last=pv_signal.get(), target=target_value)
 
     def on_pv_change(value=None, **kwargs):
         if context.fail_condition_triggered:
             return
 
-        new_val = kwargs.get("value", value)
-        if new_val is None:
+        if value is None:
             print(f"[failif debug] No 'value' key in callback for {pv_name}. Cannot evaluate crossing.")
             return
 
-        old_val = last_value_holder[0]
-        last_value_holder[0] = new_val
-
-        old_diff = old_val - target_value
-        new_diff = new_val - target_value
+        target = state.target
+        crossed = (state.last - target) * (value - target) <= 0
+        state.last = value
 
-        if old_diff * new_diff <= 0:
+        if crossed:
             print(
                 f"Failif triggered: {pv_signal.name} crossed {target_value}. Running fail script '{script_name}'."
             )
@@ -242,12 +429,21 @@ def plot(args, context):
         return
 
     pv_names = []
-    geometry_args = []
+    geometry = []
+    tail = None  # Plot only the last 'tail' seconds of the log
     for arg in args:
-        if arg.startswith("+"):
-            geometry_args.extend(arg[1:].split(","))
-        elif all(char.isdigit() or char == "," for char in arg):
-            geometry_args.extend(arg.split(","))
+        if arg.lower().startswith("tail="):
+            try:
+                tail = float(arg[5:])
+            except ValueError:
+                print(f"Invalid tail value: {arg[5:]}. Must be a number of seconds.")
+                yield from bps.null()
+                return
+            continue
+        is_geometry = arg.startswith("+")
+        pieces = (arg[1:] if is_geometry else arg).split(",")
+        if is_geometry or all(_.isdigit() or not _ for _ in pieces):  # '+...' or only digits and commas
+            geometry.extend(pieces)
         else:
             pv_names.append(arg)
 
@@ -256,54 +452,232 @@ def plot(args, context):
         yield from bps.null()
         return
 
+    size_inches = (8, 6)
+    if geometry:
+        try:
+            x, y, w, h = map(int, geometry)
+        except ValueError:
+            print(f"Invalid geometry format: {geometry}")
+            yield from bps.null()
+            return
+        size_inches = (w / 100, h / 100)
+
     if not os.path.isfile(context.log_file_path):
         print("Error: Log file does not exist. Please ensure logging is enabled.")
         yield from bps.null()
         return
 
+    # Parsing the log and rendering can take a while for long logs, so they run on the plot worker thread
+    # instead of blocking the plan. The single worker also serializes access to the shared figure and cache.
+    plot_dir = os.path.join(context.logging_dir, "plots")
+    _plot_executor.submit(_render_plot, context, pv_names, size_inches, tail, plot_dir)
+    yield from bps.null()
+
+
+def _render_plot(context, pv_names, size_inches, tail, plot_dir):
     try:
-        df = pd.read_csv(context.log_file_path, comment=None, header=0, skip_blank_lines=True)
-        df.columns = df.columns.str.strip('"')
-        df = df.reset_index(drop=True)
-        df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+        log_columns = _read_log_header(context.log_file_path)
     except Exception as e:
         print(f"Error reading log file: {e}")
-        yield from bps.null()
         return
 
-    missing_pvs = [pv for pv in pv_names if pv not in df.columns]
+    missing_pvs = [pv for pv in pv_names if pv not in log_columns]
     if missing_pvs:
         print(f"Error: The following PVs are not in the log file: {', '.join(missing_pvs)}")
-        yield from bps.null()
         return
 
-    plt.figure(figsize=(8, 6))
-    for pv_name in pv_names:
-        plt.plot(df["Timestamp"], df[pv_name], label=pv_name)
+    try:
+        if tail is not None and context._plot_cache.get("path") != context.log_file_path:
+            # Nothing cached for this file: parse only its end instead of the whole file
+            df = _read_log_tail(context.log_file_path, log_columns, pv_names, tail)
+        else:
+            df = _read_log_file(context, log_columns, pv_names)
+        if tail is not None:
+            df = _select_last_seconds(df, tail)
+    except Exception as e:
+        print(f"Error reading log file: {e}")
+        return
 
-    plt.title("PV Data Over Time")
-    plt.xlabel("Time")
-    plt.ylabel("Value")
-    plt.legend()
+    try:
+        fig, ax = _get_plot_axes()
+        ax.clear()
+        fig.set_size_inches(*size_inches)
+        for pv_name in pv_names:
+            ax.plot(df["Timestamp"], df[pv_name], label=pv_name)
 
-    if geometry_args:
-        try:
-            x, y, w, h = map(int, geometry_args)
-            plt.gcf().set_size_inches(w / 100, h / 100)
-        except ValueError:
-            print(f"Invalid geometry format: {geometry_args}")
-            yield from bps.null()
-            return
+        ax.set_title("PV Data Over Time")
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Value")
+        ax.legend()
 
-    plot_dir = os.path.join(context.logging_dir, "plots")
-    os.makedirs(plot_dir, exist_ok=True)
+        os.makedirs(plot_dir, exist_ok=True)
 
-    plot_filename = os.path.join(plot_dir, f"plot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
-    plt.savefig(plot_filename)
-    plt.close()
+        plot_filename = os.path.join(plot_dir, f"plot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
+        fig.savefig(plot_filename)
+    except Exception as e:
+        print(f"Failed to save plot: {e}")
+        return
 
     print(f"Plot saved to {plot_filename}")
-    yield from bps.null()
+
+
+def _get_plot_axes():
+    """Return the figure and axes reused by every 'plot' command, creating them on first use."""
+    global _plot_figure, _plot_axes
+    if _plot_figure is None:
+        _plot_figure, _plot_axes = plt.subplots(figsize=(8, 6))
+    return _plot_figure, _plot_axes
+
+
+def _parse_log_timestamps(timestamps):
+    # The format is known, so pandas can skip per-row format inference
+    return pd.to_datetime(timestamps, format=_LOG_TIMESTAMP_FORMAT, exact=True, cache=True)
+
+
+def _parse_log_csv(data, **kwargs):
+    """Parse CSV log data with the pyarrow engine if pyarrow is installed, otherwise with the C engine."""
+    if _HAS_PYARROW:
+        return pd.read_csv(io.BytesIO(data), engine="pyarrow", **kwargs)
+    return pd.read_csv(io.BytesIO(data), engine="c", low_memory=False, skip_blank_lines=True, **kwargs)
+
+
+def _parse_log_rows(data, log_columns, columns):
+    """Parse CSV log rows without a header row, keeping the ``columns`` out of the file's ``log_columns``."""
+    # Select the columns by position: the pyarrow engine rejects column names in 'usecols' combined with 'names'
+    positions = sorted(log_columns.index(_) for _ in columns)
+    df = _parse_log_csv(data, header=None, usecols=positions)
+    df.columns = [log_columns[_] for _ in positions]
+    return df
+
+
+def _read_complete_lines(path, offset):
+    """Read the complete lines of a file starting at ``offset``; return them and the offset after them."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    return data[:end], offset + end
+
+
+def _read_log_header(path):
+    """Return the column names from the header row of the log file."""
+    with open(path, newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _read_log_file(context, log_columns, pv_names):
+    """
+    Load the Timestamp column and the columns of ``pv_names`` from the log file as a DataFrame.
+
+    Only the requested columns are parsed. The DataFrame is cached in ``context._plot_cache``
+    together with the file path, identity (device and inode), modification time, the offset up to
+    which the file was read and the last row read. If the cached DataFrame holds all requested
+    columns and the same file only grew since, still ending in that row at the cached offset, just
+    the appended rows are parsed. Otherwise the file is read again, keeping the columns that were
+    cached before. Only complete lines are parsed, so a row that is still being written is picked
+    up next time.
+    """
+    log_file_path = context.log_file_path
+    stat = os.stat(log_file_path)
+    file_id = (stat.st_dev, stat.st_ino)
+    cache = context._plot_cache
+    columns = list(dict.fromkeys(["Timestamp", *pv_names]))
+
+    if cache.get("path") == log_file_path and cache["file_id"] == file_id and cache["header"] == log_columns:
+        df = cache["df"]
+        if all(_ in df.columns for _ in columns):
+            if stat.st_size == cache["offset"] and stat.st_mtime == cache["mtime"]:
+                return df
+
+            offset = cache["offset"]
+            if stat.st_size > offset and _file_has_bytes(log_file_path, offset, cache["last_row"]):
+                try:
+                    new_data, offset = _read_complete_lines(log_file_path, offset)
+                    if new_data.strip():
+                        new_rows = _parse_log_rows(new_data, log_columns, df.columns)
+                        new_rows["Timestamp"] = _parse_log_timestamps(new_rows["Timestamp"])
+                        df = pd.concat([df, new_rows], ignore_index=True)
+                except Exception:
+                    cache.clear()  # Whatever was appended does not fit the cached rows: read the whole file
+                else:
+                    last_row = _last_line(new_data) or cache["last_row"]
+                    cache.update(mtime=stat.st_mtime, offset=offset, last_row=last_row, df=df)
+                    return df
+
+        columns = list(dict.fromkeys([*df.columns, *columns]))
+
+    data, offset = _read_complete_lines(log_file_path, 0)
+
+    df = _parse_log_csv(data, header=0, usecols=columns)
+    df["Timestamp"] = _parse_log_timestamps(df["Timestamp"])
+
+    cache.update(
+        path=log_file_path,
+        file_id=file_id,
+        header=log_columns,
+        mtime=stat.st_mtime,
+        offset=offset,
+        last_row=_last_line(data),
+        df=df,
+    )
+    return df
+
+
+def _last_line(data):
+    """Return the last complete line of ``data``, which ends with a newline, or empty bytes."""
+    return data[data.rfind(b"\n", 0, len(data) - 1) + 1 :]
+
+
+def _file_has_bytes(path, offset, expected):
+    """Check that the bytes of the file just before ``offset`` are ``expected``."""
+    with open(path, "rb") as f:
+        f.seek(offset - len(expected))
+        return f.read(len(expected)) == expected
+
+
+def _read_log_tail(log_file_path, log_columns, pv_names, tail):
+    """
+    Load the Timestamp and ``pv_names`` columns of roughly the last ``tail`` seconds of the log file.
+
+    Only the end of the file is parsed. A block at the end is read first; the time span of its rows
+    and its average row length give an estimate of how far back ``tail`` seconds start. The block
+    is extended (at least doubled) until it covers ``tail`` seconds or reaches the start of the
+    file. The result may contain older rows; the caller selects the exact time window.
+    """
+    columns = list(dict.fromkeys(["Timestamp", *pv_names]))
+    size = os.path.getsize(log_file_path)
+    block_size = _LOG_TAIL_BLOCK_SIZE
+
+    while True:
+        offset = max(0, size - block_size)
+        data, _ = _read_complete_lines(log_file_path, offset)
+        if offset > 0:
+            data = data[data.find(b"\n") + 1 :]  # Drop the partial row at the start of the block
+            if not data.strip():  # The block does not hold a complete row yet
+                block_size *= 2
+                continue
+            df = _parse_log_rows(data, log_columns, columns)
+        else:
+            df = _parse_log_csv(data, header=0, usecols=columns)
+        df["Timestamp"] = _parse_log_timestamps(df["Timestamp"])
+
+        if offset == 0:
+            return df
+
+        span = (df["Timestamp"].iloc[-1] - df["Timestamp"].iloc[0]).total_seconds() if len(df) > 1 else 0
+        if span >= tail:
+            return df
+
+        estimate = int(len(data) * tail / span * 1.1) if span > 0 else 0
+        block_size = max(2 * block_size, estimate)
+
+
+def _select_last_seconds(df, tail):
+    """Return the rows of ``df`` within ``tail`` seconds of its last timestamp."""
+    if df.empty:
+        return df
+    start = df["Timestamp"].iloc[-1] - pd.Timedelta(seconds=tail)
+    return df[df["Timestamp"] >= start]
 
 
 def print_command(args):
@@ -363,10 +737,8 @@ def waitai(args, context):
     tolerance = float(args[3]) if len(args) > 3 else 0
     timeout = float(args[4]) if len(args) > 4 else None
 
-    if source in context.device_mapping:
-        device_name = context.device_mapping[source]
-        signal = getattr(context.devices, device_name)
-    else:
+    signal = context._name_to_device.get(source)
+    if signal is None:
         raise RuntimeError(f"Unrecognized device name: {source!r}")
 
     yield from wait_for_condition(
@@ -379,12 +751,34 @@ def waitdi(args, context):
     value = int(args[1])
     timeout = float(args[2]) if len(args) > 2 else None
 
-    if source in context.device_mapping:
-        device_name = context.device_mapping[source]
-        signal = getattr(context.devices, device_name)
-    else:
+    signal = context._name_to_device.get(source)
+    if signal is None:
         raise RuntimeError(f"Unrecognized device name: {source!r}")
 
     yield from wait_for_condition(
         signal=signal, target=value / 1000000, operator="==", tolerance=0, timeout=timeout
     )
+
+
+_COMMAND_DISPATCHER = {
+    "email": email,
+    "exit": exit_command,
+    "failif": failif,
+    "failifoff": failifoff,
+    "l": l_command,
+    "log": log,
+    "lograte": lograte,
+    "plot": plot,
+    "print": print_command,
+    "run": run,
+    "set": set,
+    "setao": setao,
+    "setdo": setdo,
+    "stop": stop,
+    "t": t_command,
+    "var": var,
+    "waitai": waitai,
+    "waitdi": waitdi,
+}
+
+_DISPATCH = build_dispatch(_COMMAND_DISPATCHER, ("args", "context", "current_script_path"))
@@ -1,64 +1,15 @@
-import inspect
-
 import bluesky.plan_stubs as bps
 
 from .exceptions import CommandNotFoundError
-from .support import motor_home, motor_move, motor_stop
+from .support import build_dispatch, motor_home, motor_move, motor_stop
 
 
 def process_motor_command(command, args, context):
-    command_dispatcher = {
-        "ac": ac,
-        "af": af,
-        "ba": ba,
-        "bg": bg,
-        "bi": bi,
-        "bl": bl,
-        "bm": bm,
-        "bt": bt,
-        "bz": bz,
-        "cc": cc,
-        "ce": ce,
-        "cn": cn,
-        "dc": dc,
-        "dp": dp,
-        "er": er,
-        "fa": fa,
-        "fe": fe,
-        "fl": fl,
-        "fv": fv,
-        "hm": hm,
-        "hv": hv,
-        "ib": ib,
-        "iht": iht,
-        "il": il,
-        "kd": kd,
-        "ki": ki,
-        "kp": kp,
-        "ld": ld,
-        "mo": mo,
-        "mt": mt,
-        "op": op,
-        "pa": pa,
-        "pr": pr,
-        "pv": pv,
-        "sc": sc,
-        "sh": sh,
-        "sp": sp,
-        "st": st,
-        "ta": ta,
-        "tp": tp,
-        "xq": xq,
-    }
-
-    if command in command_dispatcher:
-        command_function = command_dispatcher[command]
-
-        sig = inspect.signature(command_function)
-        params = list(sig.parameters)
-
-        kwargs = {"args": args, "context": context}
-        dynamic_args = [kwargs[param] for param in params if param in kwargs]
+    if command in _DISPATCH:
+        command_function, arg_indices = _DISPATCH[command]
+
+        available_args = (args, context)
+        dynamic_args = [available_args[_] for _ in arg_indices]
 
         yield from command_function(*dynamic_args)
     else:
@@ -308,3 +259,50 @@ def tp(context):
 def xq(args):
     print(f"Executing 'xq' (execute program) command with args: {args}")
     yield from bps.null()
+
+
+_COMMAND_DISPATCHER = {
+    "ac": ac,
+    "af": af,
+    "ba": ba,
+    "bg": bg,
+    "bi": bi,
+    "bl": bl,
+    "bm": bm,
+    "bt": bt,
+    "bz": bz,
+    "cc": cc,
+    "ce": ce,
+    "cn": cn,
+    "dc": dc,
+    "dp": dp,
+    "er": er,
+    "fa": fa,
+    "fe": fe,
+    "fl": fl,
+    "fv": fv,
+    "hm": hm,
+    "hv": hv,
+    "ib": ib,
+    "iht": iht,
+    "il": il,
+    "kd": kd,
+    "ki": ki,
+    "kp": kp,
+    "ld": ld,
+    "mo": mo,
+    "mt": mt,
+    "op": op,
+    "pa": pa,
+    "pr": pr,
+    "pv": pv,
+    "sc": sc,
+    "sh": sh,
+    "sp": sp,
+    "st": st,
+    "ta": ta,
+    "tp": tp,
+    "xq": xq,
+}
+
+_DISPATCH = build_dispatch(_COMMAND_DISPATCHER, ("args", "context"))
@@ -1,4 +1,5 @@
 import asyncio
+import inspect
 import time
 import uuid
 
@@ -256,6 +257,23 @@ def gen_set_condition(re):
     return _inner
 
 
+def command_parameters(command_function):
+    """Names of the parameters of a command function."""
+    return tuple(inspect.signature(command_function).parameters)
+
+
+def build_dispatch(dispatcher, argument_names):
+    """
+    Map each command name in ``dispatcher`` to its command function and the indices into ``argument_names``
+    of the arguments the function takes. ``argument_names`` lists the arguments available to a command
+    function in the order they are passed to the dispatcher.
+    """
+    return {
+        name: (func, tuple(argument_names.index(_) for _ in command_parameters(func) if _ in argument_names))
+        for name, func in dispatcher.items()
+    }
+
+
 def register_custom_instructions(re):
     _set_condition = gen_set_condition(re=re)
     re.register_command("set_condition", _set_condition)
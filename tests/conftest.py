@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from ophyd import Signal
+
+
+@pytest.fixture
+def devices():
+    ion_pump_attrs = ("Pwr", "I", "E", "Pwr_SP", "I_SP", "E_SP", "Rate_Arc", "Cnt_Target_KwHr", "Enbl_Out_Cmd")
+    return {
+        "galil": SimpleNamespace(),
+        "galil_val": Signal(name="galil_val", value=0.0),
+        "galil_rbv": Signal(name="galil_rbv", value=0.0),
+        "ION_Pump_PS": SimpleNamespace(**{_: Signal(name=f"ION_Pump_PS_{_}", value=0) for _ in ion_pump_attrs}),
+    }
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+from bluesky import RunEngine
+
+from megatron_controls.context import create_shared_context
+from megatron_controls.interpreter import MegatronInterpreter
+
+
+@pytest.fixture
+def interpreter(devices):
+    return MegatronInterpreter(shared_context=create_shared_context(devices))
+
+
+def test_loop_with_commands_starting_with_l(interpreter, tmp_path, capsys):
+    # Commands such as 'log' start with 'l' but must not be mistaken for loop headers when matching 'n'
+    script_path = tmp_path / "script.txt"
+    script_path.write_text(
+        "\n".join(
+            [
+                "# Loops containing 'log' commands",
+                "l2",
+                'log "ION Power"',
+                "print outer",
+                "L3",
+                'log "ION Current"',
+                "print inner",
+                "n",
+                'set "ION Output Enable" 1',
+                "N",
+                "print done",
+            ]
+        )
+    )
+
+    RE = RunEngine({})
+    RE(interpreter.execute_script(str(script_path)))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines.count("Executing 'print' command with text: outer") == 2
+    assert lines.count("Executing 'print' command with text: inner") == 6
+    assert lines.count("Logging for ION Power has been set up.") == 2
+    assert lines[-1] == "Executing 'print' command with text: done"
+    assert interpreter.context._name_to_device["ION Output Enable"].get() == "1"
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import csv
+import time
+
+import pytest
+from bluesky import RunEngine
+from ophyd import Signal
+
+from megatron_controls import megatron_control
+from megatron_controls.context import create_shared_context
+
+
+def _wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.005)
+
+
+def _read_log(path):
+    try:
+        with open(path, newline="") as f:
+            return list(csv.reader(f))
+    except FileNotFoundError:
+        return []
+
+
+def _log_rows(path):
+    return _read_log(path)[1:]
+
+
+@pytest.fixture
+def RE():
+    return RunEngine({})
+
+
+@pytest.fixture
+def flush_each_row(monkeypatch):
+    """Write every row to the log file right away, so the tests can follow the logger."""
+    monkeypatch.setattr(megatron_control, "_LOG_FLUSH_INTERVAL", 0)
+
+
+@pytest.fixture
+def context(devices, tmp_path):
+    context = create_shared_context(devices)
+    context.logging_dir = str(tmp_path / "logs")
+    context.log_file_path = str(tmp_path / "logs" / "log.csv")
+    context.logged_signals = {"A": Signal(name="A", value=1.5), "B": Signal(name="B", value=2.0)}
+    yield context
+
+    # The logger keeps running on the RunEngine's loop after the 'lograte' plan is done
+    context.logging_stop_event.set()
+    task = context._logging_task
+    if task is not None:
+        task.get_loop().call_soon_threadsafe(task.cancel)
+        _wait_until(task.done)
+
+
+def _stop_logging(context):
+    context.logging_stop_event.set()
+    _wait_until(context._logging_task.done)
+
+
+def test_lograte_writes_rows(RE, context):
+    context.logged_signals["C"] = Signal(name="C", value="x, y")
+    RE(megatron_control.lograte(["0.01"], context))
+    time.sleep(0.1)
+    _stop_logging(context)
+
+    with open(context.log_file_path) as f:
+        assert f.readline() == 'Timestamp,"A","B","C"\n'
+    rows = _log_rows(context.log_file_path)
+    assert len(rows) > 1
+    assert all(_[1:] == ["1.500000", "2.000000", "x, y"] for _ in rows)
+
+
+def test_rate_change_wakes_logger(RE, context, flush_each_row):
+    RE(megatron_control.lograte(["600"], context))
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) == 1)
+
+    task = context._logging_task
+    RE(megatron_control.lograte(["0.01"], context))
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) >= 5, timeout=2)
+    assert context._logging_task is task  # The running logger continued at the new rate
+
+
+def test_restart_after_stop(RE, context, flush_each_row):
+    RE(megatron_control.lograte(["600"], context))
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) == 1)
+
+    task = context._logging_task
+    context.logging_stop_event.set()
+    RE(megatron_control.lograte(["0.01"], context))
+    assert task.cancelled()  # The old logger, sleeping until its next row, was cancelled and awaited
+    assert context._logging_task is not task
+
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) >= 5)
+    _stop_logging(context)
+    assert [_[0] for _ in _read_log(context.log_file_path)].count("Timestamp") == 1
+
+
+def test_log_file_path_change(RE, context, flush_each_row, tmp_path):
+    first_path = context.log_file_path
+    second_path = str(tmp_path / "logs" / "second.csv")
+    RE(megatron_control.lograte(["0.01"], context))
+    _wait_until(lambda: len(_log_rows(first_path)) >= 2)
+
+    context.log_file_path = second_path
+    _wait_until(lambda: len(_log_rows(second_path)) >= 2)
+    first_rows = _log_rows(first_path)
+    time.sleep(0.05)
+    _stop_logging(context)
+
+    assert _log_rows(first_path) == first_rows  # The first file was closed
+    assert _read_log(second_path)[0] == ["Timestamp", "A", "B"]
+
+
+@pytest.mark.parametrize(
+    ("limit", "value"), [("_LOG_BUFFER_ROWS", 3), ("_LOG_BUFFER_SIZE", 1), ("_LOG_FLUSH_INTERVAL", 0)]
+)
+def test_row_buffer_limits(RE, context, monkeypatch, limit, value):
+    monkeypatch.setattr(megatron_control, "_LOG_BUFFER_ROWS", 1000)
+    monkeypatch.setattr(megatron_control, "_LOG_BUFFER_SIZE", 1 << 30)
+    monkeypatch.setattr(megatron_control, "_LOG_FLUSH_INTERVAL", 1000)
+    monkeypatch.setattr(megatron_control, limit, value)
+
+    RE(megatron_control.lograte(["0.005"], context))
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) >= 6)  # Written while the logger runs
+    if limit == "_LOG_BUFFER_ROWS":
+        assert len(_log_rows(context.log_file_path)) % 3 == 0
+
+
+def test_rows_buffered_until_stop(RE, context, monkeypatch):
+    monkeypatch.setattr(megatron_control, "_LOG_BUFFER_ROWS", 1000)
+    monkeypatch.setattr(megatron_control, "_LOG_FLUSH_INTERVAL", 1000)
+    RE(megatron_control.lograte(["0.005"], context))
+    time.sleep(0.1)
+    assert _log_rows(context.log_file_path) == []
+
+    _stop_logging(context)
+    assert len(_log_rows(context.log_file_path)) > 1  # Written when the logger stopped
+
+
+def test_value_type_change(RE, context, flush_each_row):
+    # Only floats at first: rows take the single format string path
+    RE(megatron_control.lograte(["0.01"], context))
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) >= 2)
+
+    context.logged_signals["B"].put(None)
+    _wait_until(lambda: _log_rows(context.log_file_path)[-1][1:] == ["1.500000", ""])
+    context.logged_signals["B"].put("off")
+    _wait_until(lambda: _log_rows(context.log_file_path)[-1][1:] == ["1.500000", "off"])
+    context.logged_signals["B"].put(3.0)
+    _wait_until(lambda: _log_rows(context.log_file_path)[-1][1:] == ["1.500000", "3.000000"])
+
+
+def test_logged_signals_changed_in_place(RE, context, flush_each_row):
+    RE(megatron_control.lograte(["0.01"], context))
+    _wait_until(lambda: len(_log_rows(context.log_file_path)) >= 2)
+
+    context.logged_signals["A"] = Signal(name="A", value=7.0)
+    context.logged_signals_version += 1
+    _wait_until(lambda: _log_rows(context.log_file_path)[-1][1:] == ["7.000000", "2.000000"])
+
+    del context.logged_signals["B"]
+    context.logged_signals_version += 1
+    _wait_until(lambda: _log_rows(context.log_file_path)[-1][1:] == ["7.000000", ""])
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from megatron_controls import megatron_control
+
+_START = datetime(2026, 1, 1)
+
+
+@pytest.fixture(params=["c", "pyarrow"])
+def engine(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(megatron_control, "_HAS_PYARROW", request.param == "pyarrow")
+    return request.param
+
+
+def _log_rows(start, stop, period=1.0):
+    rows = []
+    for i in range(start, stop):
+        timestamp = (_START + timedelta(seconds=i * period)).strftime(megatron_control._LOG_TIMESTAMP_FORMAT)
+        rows.append(f'{timestamp},{i * 0.5:.6f},{i:.6f},"text, {i}"\n')
+    return "".join(rows)
+
+
+def _write_log(path, start, stop, period=1.0):
+    with open(path, "w") as f:
+        f.write('Timestamp,"A","B","C"\n')
+        f.write(_log_rows(start, stop, period))
+
+
+def test_read_log_file_appended_rows(engine, tmp_path):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 10)
+    context = SimpleNamespace(log_file_path=str(log_file_path), _plot_cache={})
+    log_columns = megatron_control._read_log_header(context.log_file_path)
+
+    df = megatron_control._read_log_file(context, log_columns, ["A"])
+    assert list(df.columns) == ["Timestamp", "A"]
+    assert len(df) == 10
+
+    with open(log_file_path, "a") as f:
+        f.write(_log_rows(10, 15))
+    offset = context._plot_cache["offset"]
+
+    df = megatron_control._read_log_file(context, log_columns, ["A"])
+    assert context._plot_cache["offset"] > offset  # Only the appended rows were parsed
+    assert len(df) == 15
+    assert df["A"].tolist() == [i * 0.5 for i in range(15)]
+    assert df["Timestamp"].iloc[-1] == pd.Timestamp(_START + timedelta(seconds=14))
+
+    # The result matches reading the whole file from scratch
+    context._plot_cache.clear()
+    expected = megatron_control._read_log_file(context, log_columns, ["A"])
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("replace", ["new_file", "in_place"])
+def test_read_log_file_replaced(engine, tmp_path, replace):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 10)
+    context = SimpleNamespace(log_file_path=str(log_file_path), _plot_cache={})
+    log_columns = megatron_control._read_log_header(context.log_file_path)
+    megatron_control._read_log_file(context, log_columns, ["A"])
+
+    # A new log with the same header, larger than the rows read from the old one
+    if replace == "new_file":
+        _write_log(tmp_path / "new.csv", 100, 130)
+        (tmp_path / "new.csv").replace(log_file_path)
+    else:
+        _write_log(log_file_path, 100, 130)
+
+    df = megatron_control._read_log_file(context, log_columns, ["A"])
+    assert df["A"].tolist() == [i * 0.5 for i in range(100, 130)]
+
+
+def test_read_log_file_append_error_drops_cache(engine, tmp_path, monkeypatch):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 10)
+    context = SimpleNamespace(log_file_path=str(log_file_path), _plot_cache={})
+    log_columns = megatron_control._read_log_header(context.log_file_path)
+    megatron_control._read_log_file(context, log_columns, ["A"])
+
+    with open(log_file_path, "a") as f:
+        f.write(_log_rows(10, 15))
+
+    def _parse_log_rows(*args):
+        raise ValueError("Unexpected rows")
+
+    monkeypatch.setattr(megatron_control, "_parse_log_rows", _parse_log_rows)
+    df = megatron_control._read_log_file(context, log_columns, ["A"])
+    assert df["A"].tolist() == [i * 0.5 for i in range(15)]
+    assert len(context._plot_cache["df"]) == 15
+
+
+@pytest.mark.parametrize("tail", [1, 60, 3000, 4999, 10000])
+def test_read_log_tail(engine, tmp_path, tail):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 5000)  # Several times larger than the first block read from the end
+    log_columns = megatron_control._read_log_header(str(log_file_path))
+
+    df = megatron_control._read_log_tail(str(log_file_path), log_columns, ["B", "A"], tail)
+    assert sorted(df.columns) == ["A", "B", "Timestamp"]
+    if tail < 60:
+        assert len(df) < 5000  # Only the end of the file was parsed
+
+    df = megatron_control._select_last_seconds(df, tail)
+    first = max(0, 4999 - tail)
+    assert df["B"].tolist() == [float(i) for i in range(first, 5000)]
+    assert df["Timestamp"].iloc[0] == pd.Timestamp(_START + timedelta(seconds=first))
+
+
+def test_read_log_tail_grows_block_by_estimate(engine, tmp_path, monkeypatch):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 5000, period=0.01)
+    log_columns = megatron_control._read_log_header(str(log_file_path))
+    monkeypatch.setattr(megatron_control, "_LOG_TAIL_BLOCK_SIZE", 1024)
+
+    read_offsets = []
+    read_complete_lines = megatron_control._read_complete_lines
+
+    def _read_complete_lines(path, offset):
+        read_offsets.append(offset)
+        return read_complete_lines(path, offset)
+
+    monkeypatch.setattr(megatron_control, "_read_complete_lines", _read_complete_lines)
+
+    # A 1 KiB block holds well under a second of rows; the estimate jumps close to 20 seconds right away
+    df = megatron_control._read_log_tail(str(log_file_path), log_columns, ["A"], 20)
+    assert len(read_offsets) <= 3
+    assert read_offsets[-1] > 0
+    df = megatron_control._select_last_seconds(df, 20)
+    assert len(df) == 2001
+
+
+def test_select_last_seconds():
+    timestamps = pd.to_datetime([_START + timedelta(seconds=i) for i in range(10)])
+    df = pd.DataFrame({"Timestamp": timestamps, "A": range(10)})
+
+    assert megatron_control._select_last_seconds(df, 3)["A"].tolist() == [6, 7, 8, 9]
+    assert megatron_control._select_last_seconds(df, 0)["A"].tolist() == [9]
+    assert len(megatron_control._select_last_seconds(df, 100)) == 10
+    assert megatron_control._select_last_seconds(df.iloc[:0], 3).empty
+
+
+@pytest.mark.parametrize(
+    ("args", "pv_names", "size_inches"),
+    [
+        (["A", "0,0,800,600"], ["A"], (8, 6)),
+        (["A", "+0,0,400,300"], ["A"], (4, 3)),
+        (["A", "-5"], ["A", "-5"], (8, 6)),
+        (["A", " 5"], ["A", " 5"], (8, 6)),
+        (["A", "1_0"], ["A", "1_0"], (8, 6)),
+    ],
+)
+def test_plot_geometry_args(tmp_path, monkeypatch, args, pv_names, size_inches):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 10)
+    context = SimpleNamespace(log_file_path=str(log_file_path), logging_dir=str(tmp_path), logged_signals={})
+    rendered = []
+    monkeypatch.setattr(megatron_control._plot_executor, "submit", lambda func, *args: rendered.append(args))
+
+    list(megatron_control.plot(args, context))
+    assert [(_[1], _[2]) for _ in rendered] == [(pv_names, size_inches)]
+
+
+@pytest.mark.parametrize("geometry", ["+a,b", "5,,6", "1,2,3,4,5"])
+def test_plot_invalid_geometry(tmp_path, monkeypatch, capsys, geometry):
+    log_file_path = tmp_path / "log.csv"
+    _write_log(log_file_path, 0, 10)
+    context = SimpleNamespace(log_file_path=str(log_file_path), logging_dir=str(tmp_path), logged_signals={})
+    rendered = []
+    monkeypatch.setattr(megatron_control._plot_executor, "submit", lambda func, *args: rendered.append(args))
+
+    list(megatron_control.plot(["A", geometry], context))
+    assert not rendered
+    assert "Invalid geometry format" in capsys.readouterr().out